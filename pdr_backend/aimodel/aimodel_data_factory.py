@@ -113,8 +113,10 @@ class AimodelDataFactory:
             train_feeds_list = train_feeds
         else:
             train_feeds_list = [predict_feed]
+        # read the ss values once, rather than per feed / per shift
         ss = self.ss.aimodel_ss
-        x_dim_len = len(train_feeds_list) * ss.autoregressive_n
+        ar_n, max_n_train = ss.autoregressive_n, ss.max_n_train
+        x_dim_len = len(train_feeds_list) * ar_n
 
         # main work
         x_list = []  # [col_i] : Series. Build this up. Not df here (slow)
@@ -128,8 +130,8 @@ class AimodelDataFactory:
         for hist_col in target_hist_cols:
             assert hist_col in mergedohlcv_df.columns, f"missing data col: {hist_col}"
             z = mergedohlcv_df[hist_col].to_list()  # [..., z(t-2), z(t-1)]
-            maxshift = testshift + ss.autoregressive_n
-            N_train = min(ss.max_n_train, len(z) - maxshift - 1)
+            maxshift = testshift + ar_n
+            N_train = min(max_n_train, len(z) - maxshift - 1)
             if N_train <= 0:
                 logger.error(
                     "Too little data. len(z)=%d, maxshift=%d "
@@ -139,10 +141,10 @@ class AimodelDataFactory:
                     len(z),
                     maxshift,
                     testshift,
-                    ss.autoregressive_n,
+                    ar_n,
                 )
                 sys.exit(1)
-            for delayshift in range(ss.autoregressive_n, 0, -1):  # eg [2, 1, 0]
+            for delayshift in range(ar_n, 0, -1):  # eg [2, 1, 0]
                 shift = testshift + delayshift
                 x_col = hist_col + f":t-{delayshift+1}"
                 assert (shift + N_train + 1) <= len(z)
@@ -168,7 +170,7 @@ class AimodelDataFactory:
 
         # postconditions
         assert X.shape[0] == y.shape[0]
-        assert X.shape[0] <= (ss.max_n_train + 1)
+        assert X.shape[0] <= (max_n_train + 1)
         assert X.shape[1] == x_dim_len
         assert isinstance(x_df, pd.DataFrame)
 
@@ -1,6 +1,7 @@
 import logging
 from typing import List
 
+import polars as pl
 from enforce_typing import enforce_types
 from pdr_backend.ppss.ppss import PPSS
 from pdr_backend.lake.gql_data_factory import GQLDataFactory
@@ -47,8 +48,10 @@ class PredFilter:
 
         predictions_df = self.predictions_df
         predictions_df = predictions_df.filter(
-            predictions_df["ID"]
-            .map_elements(lambda x: x.split("-")[0].lower(), return_dtype=str)
+            pl.col("ID")
+            .str.split("-")
+            .list.first()
+            .str.to_lowercase()
             .is_in(feed_addrs)
         )
         self.predictions_df = predictions_df
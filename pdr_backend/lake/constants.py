@@ -1,3 +1,5 @@
+from typing import Final
+
 import numpy as np
 import polars as pl
 
@@ -15,3 +17,14 @@ TOHLCV_SCHEMA_PL = dict(zip(TOHLCV_COLS, TOHLCV_DTYPES_PL))
 # warn if OHLCV_MULT_MIN * timeframe < time-between-data < OHLCV_MULT_MAX * t
 OHLCV_MULT_MIN = 0.5
 OHLCV_MULT_MAX = 2.5
+
+# rows per parquet row group. Files are sorted by timestamp, so each row group's
+# min/max timestamp stats bound a contiguous time window that scans can skip
+PARQUET_ROW_GROUP_SIZE = 50_000
+
+# parquet codec. zstd level 3 gives smaller files than snappy at similar cpu,
+# so less I/O on every later scan. Set explicitly, not left to polars defaults.
+# Final keeps its type as Literal["zstd"]; polars' write_parquet takes a Literal
+# compression type, so mypy rejects a plain str here
+PARQUET_COMPRESSION: Final = "zstd"
+PARQUET_COMPRESSION_LEVEL = 3
@@ -1,5 +1,10 @@
+import json
 import logging
-from typing import Callable, Dict
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
 from enforce_typing import enforce_types
 import polars as pl
 from pdr_backend.lake.table import Table
@@ -34,6 +39,9 @@ from pdr_backend.util.time_types import UnixTimeMs
 
 logger = logging.getLogger("gql_data_factory")
 
+# default lifetime of the on-disk contract list cache, in seconds
+CONTRACT_CACHE_TTL = 3600
+
 
 @enforce_types
 class GQLDataFactory:
@@ -53,28 +61,24 @@ class GQLDataFactory:
 
         # filter by feed contract address
         network = get_sapphire_postfix(ppss.web3_pp.network)
-        contract_list = get_all_contract_ids_by_owner(
-            owner_address=self.ppss.web3_pp.owner_addrs,
-            network=network,
-        )
-        contract_list = [f.lower() for f in contract_list]
+        contract_list = self._get_contract_list(network)
+
+        # configure all tables that will be recorded onto lake.
+        # Each Table reads its parquet file on construction; overlap the reads
+        table_specs = {
+            "pdr_predictions": (predictions_table_name, predictions_schema),
+            "pdr_subscriptions": (subscriptions_table_name, subscriptions_schema),
+            "pdr_truevals": (truevals_table_name, truevals_schema),
+            "pdr_payouts": (payouts_table_name, payouts_schema),
+        }
+        with ThreadPoolExecutor(max_workers=len(table_specs)) as executor:
+            tables = executor.map(
+                lambda spec: Table(spec[0], spec[1], ppss), table_specs.values()
+            )
+            tables_by_key = dict(zip(table_specs, tables))
 
-        # configure all tables that will be recorded onto lake
         self.record_config = {
-            "tables": {
-                "pdr_predictions": Table(
-                    predictions_table_name,
-                    predictions_schema,
-                    ppss,
-                ),
-                "pdr_subscriptions": Table(
-                    subscriptions_table_name,
-                    subscriptions_schema,
-                    ppss,
-                ),
-                "pdr_truevals": Table(truevals_table_name, truevals_schema, ppss),
-                "pdr_payouts": Table(payouts_table_name, payouts_schema, ppss),
-            },
+            "tables": tables_by_key,
             "fetch_functions": {
                 "pdr_predictions": fetch_filtered_predictions,
                 "pdr_subscriptions": fetch_filtered_subscriptions,
@@ -86,6 +90,44 @@ class GQLDataFactory:
             },
         }
 
+    def _get_contract_list(self, network: str) -> List[str]:
+        """
+        @description
+          Get the (lowercased) feed contract addresses owned by owner_addrs.
+          The list rarely changes, so it's cached in parquet_dir for
+          PDR_CONTRACT_CACHE_TTL seconds, rather than queried on every init.
+          A TTL of 0 disables the cache.
+
+        @arguments
+          network -- eg "mainnet"
+
+        @return
+          contract_list -- list of contract addresses
+        """
+        owner_addrs = self.ppss.web3_pp.owner_addrs
+        ttl = _contract_cache_ttl()
+        cache_filename = os.path.join(
+            self.ppss.lake_ss.parquet_dir, f".contract_list.{network}.json"
+        )
+
+        if ttl > 0:
+            cached_list = _read_contract_cache(cache_filename, owner_addrs, ttl)
+            if cached_list:
+                logger.info("Loaded contract list from %s", cache_filename)
+                return cached_list
+
+        contract_list = get_all_contract_ids_by_owner(
+            owner_address=owner_addrs,
+            network=network,
+        )
+        contract_list = [f.lower() for f in contract_list]
+
+        # don't cache an empty list: one bad subgraph response would
+        # otherwise hide every feed for the whole TTL
+        if ttl > 0 and contract_list:
+            _write_contract_cache(cache_filename, owner_addrs, contract_list)
+        return contract_list
+
     def get_gql_tables(self) -> Dict[str, Table]:
         """
         @description
@@ -101,10 +143,12 @@ class GQLDataFactory:
         # But, we don't want fin_timestamp changing as we gather data here.
         # To solve, for a given call to this method, we make a constant fin_ut
 
-        print(f"  Data start: {self.ppss.lake_ss.st_timestamp.pretty_timestr()}")
-        print(f"  Data fin: {self.ppss.lake_ss.st_timestamp.pretty_timestr()}")
+        st_ut = self.ppss.lake_ss.st_timestamp
+        fin_ut = self.ppss.lake_ss.fin_timestamp
+        print(f"  Data start: {st_ut.pretty_timestr()}")
+        print(f"  Data fin: {fin_ut.pretty_timestr()}")
 
-        self._update()
+        self._update(st_ut, fin_ut)
 
         logger.info("Get historical data across many subgraphs. Done.")
 
@@ -114,7 +158,7 @@ class GQLDataFactory:
 
         return self.record_config["tables"]
 
-    def _update(self):
+    def _update(self, st_ut: UnixTimeMs, fin_ut: UnixTimeMs):
         """
         @description
             Iterate across all gql queries and update their parquet files:
@@ -127,35 +171,118 @@ class GQLDataFactory:
             2. Integrate other queries and summaries
             3. Integrate config/pp if needed
         @arguments
+            st_ut -- lake start timestamp, in ms, in UTC
             fin_ut -- a timestamp, in ms, in UTC
         """
 
-        for _, table in self.record_config["tables"].items():
-            filename = table._parquet_filename()
-            st_ut = table._calc_start_ut(filename)
-            fin_ut = self.ppss.lake_ss.fin_timestamp
-            print(f"      Aim to fetch data from start time: {st_ut.pretty_timestr()}")
-            if st_ut > min(UnixTimeMs.now(), fin_ut):
-                print("      Given start time, no data to gather. Exit.")
-
-            # to satisfy mypy, get an explicit function pointer
-            do_fetch: Callable[[str, int, int, int, int, Dict, str], pl.DataFrame] = (
-                table.get_pdr_df
+        # each table is fetched from its own subgraph query and written to its
+        # own parquet file, so tables can be updated concurrently. Fetching is
+        # network-bound; threads overlap the round-trips
+        tables = self.record_config["tables"]
+        with ThreadPoolExecutor(max_workers=len(tables)) as executor:
+            list(
+                executor.map(
+                    lambda table: self._update_table(table, st_ut, fin_ut),
+                    tables.values(),
+                )
             )
 
-            # number of data at which we want to save to file
-            save_backoff_limit = 5000
-            # number of data fetched from the subgraph at a time
-            pagination_limit = 1000
-
-            print(f"Updating table {table.table_name}")
-            do_fetch(
-                self.record_config["fetch_functions"][table.table_name],
-                self.ppss.web3_pp.network,
-                st_ut,
-                fin_ut,
-                save_backoff_limit,
-                pagination_limit,
-                self.record_config["config"],
-            )
-            table.load()
+    def _update_table(self, table: Table, st_ut: UnixTimeMs, fin_ut: UnixTimeMs):
+        """
+        @description
+            Fetch new data for one table, append it to its parquet file,
+            then reload the table's df from file.
+
+        @arguments
+            table -- table to update
+            st_ut -- lake start timestamp, in ms, in UTC
+            fin_ut -- a timestamp, in ms, in UTC
+        """
+        filename = table._parquet_filename()
+        fetch_st_ut = table._calc_start_ut(filename)
+        # tables update concurrently, so tag each line with the table's name
+        print(
+            f"      {table.table_name}: Aim to fetch data from start time: "
+            f"{fetch_st_ut.pretty_timestr()}"
+        )
+        if fetch_st_ut > min(UnixTimeMs.now(), fin_ut):
+            print(f"      {table.table_name}: Given start time, no data to gather.")
+            table.load(st_ut=st_ut, fin_ut=fin_ut)
+            return
+
+        # to satisfy mypy, get an explicit function pointer
+        do_fetch: Callable[
+            [Callable, str, UnixTimeMs, UnixTimeMs, int, int, Dict], None
+        ] = table.get_pdr_df
+
+        # number of data at which we want to save to file
+        save_backoff_limit = 5000
+        # number of data fetched from the subgraph at a time
+        pagination_limit = 1000
+
+        print(f"Updating table {table.table_name}")
+        do_fetch(
+            self.record_config["fetch_functions"][table.table_name],
+            self.ppss.web3_pp.network,
+            fetch_st_ut,
+            fin_ut,
+            save_backoff_limit,
+            pagination_limit,
+            self.record_config["config"],
+        )
+        table.load(st_ut=st_ut, fin_ut=fin_ut)
+
+
+def _contract_cache_ttl() -> int:
+    """Contract list cache lifetime in s, from env PDR_CONTRACT_CACHE_TTL"""
+    ttl_str = os.getenv("PDR_CONTRACT_CACHE_TTL")
+    if ttl_str is None:
+        return CONTRACT_CACHE_TTL
+    try:
+        return int(ttl_str)
+    except ValueError:
+        logger.warning(
+            "Bad PDR_CONTRACT_CACHE_TTL=%r, using %d", ttl_str, CONTRACT_CACHE_TTL
+        )
+        return CONTRACT_CACHE_TTL
+
+
+def _read_contract_cache(
+    cache_filename: str, owner_addrs: str, ttl: int
+) -> Optional[List[str]]:
+    """Cached contract list, or None if missing, expired, or unreadable"""
+    if not os.path.exists(cache_filename):
+        return None
+    if time.time() - os.path.getmtime(cache_filename) >= ttl:
+        return None
+
+    # a corrupt or hand-edited cache is just a cache miss
+    try:
+        with open(cache_filename, "r") as f:
+            cache = json.load(f)
+        if cache["owner_addrs"] != owner_addrs:
+            return None
+        return cache["contract_list"]
+    except (OSError, json.JSONDecodeError, KeyError, TypeError) as e:
+        logger.warning("Ignoring bad contract list cache: %s", e)
+        return None
+
+
+def _write_contract_cache(
+    cache_filename: str, owner_addrs: str, contract_list: List[str]
+):
+    """Write the contract list cache. Failures only log; it's just a cache"""
+    # write to a uniquely-named temp file then swap it in, so readers never
+    # see a partial file, and concurrent writers don't clobber each other
+    tmp_filename = None
+    try:
+        fd, tmp_filename = tempfile.mkstemp(
+            dir=os.path.dirname(cache_filename), suffix=".tmp"
+        )
+        with os.fdopen(fd, "w") as f:
+            json.dump({"owner_addrs": owner_addrs, "contract_list": contract_list}, f)
+        os.replace(tmp_filename, cache_filename)
+    except OSError as e:
+        logger.warning("Couldn't write contract list cache: %s", e)
+        if tmp_filename is not None and os.path.exists(tmp_filename):
+            os.remove(tmp_filename)
@@ -1,5 +1,6 @@
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict
 
 import polars as pl
@@ -12,7 +13,6 @@ from pdr_backend.lake.clean_raw_ohlcv import clean_raw_ohlcv
 from pdr_backend.lake.constants import TOHLCV_COLS, TOHLCV_SCHEMA_PL
 from pdr_backend.lake.merge_df import merge_rawohlcv_dfs
 from pdr_backend.lake.plutil import (
-    concat_next_df,
     has_data,
     initialize_rawohlcv_df,
     load_rawohlcv_file,
@@ -117,8 +117,9 @@ class OhlcvDataFactory:
             logger.info("Given start time, no data to gather. Exit.")
             return
 
-        # empty ohlcv df
+        # empty ohlcv df, plus fetched dfs to concatenate once at the end
         df = initialize_rawohlcv_df()
+        next_dfs = []
         while True:
             limit = 1000
             if exch_str == "dydx":
@@ -132,24 +133,24 @@ class OhlcvDataFactory:
                 limit=limit,
             )
             tohlcv_data = clean_raw_ohlcv(raw_tohlcv_data, feed, st_ut, fin_ut)
-            # concat both TOHLCV data
             next_df = pl.DataFrame(
                 tohlcv_data,
                 schema=TOHLCV_SCHEMA_PL,
                 orient="row",
             )
-            df = concat_next_df(df, next_df)
+            next_dfs.append(next_df)
 
             if len(tohlcv_data) < limit:  # no more data, we're at newest time
                 break
 
             # prep next iteration
-            newest_ut_value = df.tail(1)["timestamp"][0]
+            newest_ut_value = next_df.tail(1)["timestamp"][0]
 
             logger.debug("newest_ut_value: %s", newest_ut_value)
             st_ut = UnixTimeMs(newest_ut_value + feed.timeframe.ms)
 
-        # output to file
+        # concat all TOHLCV data in one go, then output to file
+        df = pl.concat([df] + next_dfs)
         save_rawohlcv_file(filename, df)
 
         # done
@@ -209,13 +210,19 @@ class OhlcvDataFactory:
         for exch_str in self.ss.exchange_strs:
             rawohlcv_dfs[exch_str] = {}
 
-        for feed in self.ss.feeds:
+        def _load(feed: ArgFeed) -> pl.DataFrame:
+            filename = self._rawohlcv_filename(feed)
+            return load_rawohlcv_file(filename, TOHLCV_COLS, st_ut, fin_ut)
+
+        # one file per feed. Polars releases the GIL while reading parquet,
+        # so the files are read concurrently
+        with ThreadPoolExecutor() as executor:
+            loaded_dfs = list(executor.map(_load, self.ss.feeds))
+
+        for feed, rawohlcv_df in zip(self.ss.feeds, loaded_dfs):
             pair_str = str(feed.pair)
             exch_str = str(feed.exchange)
             assert "/" in str(pair_str), f"pair_str={pair_str} needs '/'"
-            filename = self._rawohlcv_filename(feed)
-            cols = TOHLCV_COLS
-            rawohlcv_df = load_rawohlcv_file(filename, cols, st_ut, fin_ut)
 
             assert "timestamp" in rawohlcv_df.columns
             assert "datetime" not in rawohlcv_df.columns
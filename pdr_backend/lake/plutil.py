@@ -8,13 +8,20 @@ import os
 import shutil
 from io import StringIO
 from tempfile import mkdtemp
-from typing import List, Dict, Iterable, Union, Tuple
+from typing import List, Dict, Iterable, Union
 
 import numpy as np
 import polars as pl
+import pyarrow.parquet as pq
 from enforce_typing import enforce_types
 
-from pdr_backend.lake.constants import TOHLCV_COLS, TOHLCV_SCHEMA_PL
+from pdr_backend.lake.constants import (
+    PARQUET_COMPRESSION,
+    PARQUET_COMPRESSION_LEVEL,
+    PARQUET_ROW_GROUP_SIZE,
+    TOHLCV_COLS,
+    TOHLCV_SCHEMA_PL,
+)
 from pdr_backend.util.time_types import UnixTimeMs
 
 logger = logging.getLogger("lake_plutil")
@@ -61,13 +68,26 @@ def save_rawohlcv_file(filename: str, df: pl.DataFrame):
     df = df.select(columns)
 
     if os.path.exists(filename):  # append existing file
-        cur_df = pl.read_parquet(filename)
-        df = pl.concat([cur_df, df])
-        df.write_parquet(filename)
-        n_new = df.shape[0] - cur_df.shape[0]
-        logger.info("Just appended %d df rows to file %s", n_new, filename)
+        # parquet can't append in place. Rather than reading the whole file
+        # into memory, stream old + new rows into a temp file, then swap it in
+        tmp_filename = filename + ".tmp"
+        pl.concat([pl.scan_parquet(filename), df.lazy()]).sink_parquet(
+            tmp_filename,
+            compression=PARQUET_COMPRESSION,
+            compression_level=PARQUET_COMPRESSION_LEVEL,
+            statistics=True,
+            row_group_size=PARQUET_ROW_GROUP_SIZE,
+        )
+        os.replace(tmp_filename, filename)
+        logger.info("Just appended %d df rows to file %s", df.shape[0], filename)
     else:  # write new file
-        df.write_parquet(filename)
+        df.write_parquet(
+            filename,
+            compression=PARQUET_COMPRESSION,
+            compression_level=PARQUET_COMPRESSION_LEVEL,
+            statistics=True,
+            row_group_size=PARQUET_ROW_GROUP_SIZE,
+        )
         logger.info("Just saved df with %s rows to new file %s", df.shape[0], filename)
 
 
@@ -103,12 +123,15 @@ def load_rawohlcv_file(filename: str, cols=None, st=None, fin=None) -> pl.DataFr
     st = st if st is not None else 0
     fin = fin if fin is not None else np.inf
 
-    # load tohlcv
-    df = pl.read_parquet(
-        filename,
-        columns=cols,
+    # load tohlcv. Lazy scan, so that the column selection and the
+    # timestamp filter get pushed down into the parquet reader. Streaming,
+    # so that the file is processed in batches rather than all at once
+    df = (
+        pl.scan_parquet(filename)
+        .select(cols)
+        .filter((pl.col("timestamp") >= st) & (pl.col("timestamp") <= fin))
+        .collect(streaming=True)
     )
-    df = df.filter((pl.col("timestamp") >= st) & (pl.col("timestamp") <= fin))
 
     # initialize df and enforce schema
     df0 = initialize_rawohlcv_df(cols)
@@ -123,9 +146,10 @@ def load_rawohlcv_file(filename: str, cols=None, st=None, fin=None) -> pl.DataFr
 
 @enforce_types
 def has_data(filename: str) -> bool:
-    """Returns True if the file has >0 data entries"""
-    df = pl.read_parquet(filename, n_rows=1)
-    return not df.is_empty()
+    """Returns True if the file has >0 data entries.
+    Only reads the parquet footer; no row data gets decoded.
+    """
+    return pq.read_metadata(filename).num_rows > 0
 
 
 @enforce_types
@@ -142,9 +166,8 @@ def newest_ut(filename: str) -> UnixTimeMs:
 @enforce_types
 def _get_tail_df(filename: str, n: int = 5) -> pl.DataFrame:
     """Returns the last record in a parquet file, as a list"""
-
-    df = pl.read_parquet(filename)
-    tail_df = df.tail(n)
+    # lazy, so only the tail rows get materialized
+    tail_df = pl.scan_parquet(filename).tail(n).collect()
     if not tail_df.is_empty():
         return tail_df
     raise ValueError(f"File {filename} has no entries")
@@ -164,8 +187,8 @@ def oldest_ut(filename: str) -> UnixTimeMs:
 @enforce_types
 def _get_head_df(filename: str, n: int = 5) -> pl.DataFrame:
     """Returns the head of parquet file, as a df"""
-    df = pl.read_parquet(filename)
-    head_df = df.head(n)
+    # lazy, so only the head rows get read
+    head_df = pl.scan_parquet(filename).head(n).collect()
     if not head_df.is_empty():
         return head_df
     raise ValueError(f"File {filename} has no entries")
@@ -227,26 +250,25 @@ def left_join_with(
 
 
 @enforce_types
-def pick_df_and_ids_on_period(
+def pick_df_on_period(
     target: pl.DataFrame,
     start_timestamp: int,
     finish_timestamp: int,
-) -> Tuple[pl.DataFrame, List[str]]:
+) -> pl.DataFrame:
     """
     @description
-        Filter dataframe with timestamp and return the ID list.
+        Filter dataframe with timestamp.
     @arguments
         target -- dataframe to be filtered
         start_timestamp -- start timestamp
         finish_timestamp -- finish timestamp
     @returns
-        Filtered dataframe and ID list
+        Filtered dataframe
     """
-    target = target.filter(
+    return target.filter(
         (pl.col("timestamp") >= start_timestamp)
         & (pl.col("timestamp") <= finish_timestamp)
     )
-    return (target, target["ID"].to_list())
 
 
 @enforce_types
@@ -1,10 +1,16 @@
 import logging
 import os
-from typing import Dict, Callable
+from typing import Callable, Dict, List, Optional
 import polars as pl
+import pyarrow.parquet as pq
 from enforce_typing import enforce_types
 from pdr_backend.ppss.ppss import PPSS
-from pdr_backend.lake.plutil import has_data, newest_ut
+from pdr_backend.lake.constants import (
+    PARQUET_COMPRESSION,
+    PARQUET_COMPRESSION_LEVEL,
+    PARQUET_ROW_GROUP_SIZE,
+)
+from pdr_backend.lake.plutil import newest_ut
 from pdr_backend.util.networkutil import get_sapphire_postfix
 from pdr_backend.util.time_types import UnixTimeMs
 from pdr_backend.lake.plutil import _object_list_to_df
@@ -23,22 +29,42 @@ class Table:
         self.load()
 
     @enforce_types
-    def load(self):
+    def load(self, columns=None, st_ut=None, fin_ut=None):
         """
         Read the data from the Parquet file into a DataFrame object
+
+        @arguments
+          columns -- columns to read, eg ["ID", "timestamp"]. Set to None
+            for the table's schema columns that the file has
+          st_ut -- start timestamp, in ms. Set to None for lake_ss.st_timestamp
+          fin_ut -- fin timestamp, in ms. Set to None for lake_ss.fin_timestamp.
+            Pass a snapshot when fin_timestr is "now", to keep it fixed
         """
         filename = self._parquet_filename()
-        st_ut = self.ppss.lake_ss.st_timestamp
-        fin_ut = self.ppss.lake_ss.fin_timestamp
+        if st_ut is None:
+            st_ut = self.ppss.lake_ss.st_timestamp
+        if fin_ut is None:
+            fin_ut = self.ppss.lake_ss.fin_timestamp
 
         # load all data from file
         # check if file exists
         # if file doesn't exist, return an empty dataframe with the expected schema
         if os.path.exists(filename):
             logger.info("Loading parquet for %s", self.table_name)
-            df = pl.read_parquet(filename)
-            df = df.filter(
-                (pl.col("timestamp") >= st_ut) & (pl.col("timestamp") <= fin_ut)
+            # lazy scan, so row groups outside [st_ut, fin_ut] are skipped,
+            # and only the wanted columns get decoded
+            lazy_df = pl.scan_parquet(filename)
+            if columns is None:
+                # the file's schema is read from its footer. Older files may
+                # lack some schema columns; read the ones they have
+                file_cols = lazy_df.columns
+                columns = [c for c in self.df_schema if c in file_cols] or file_cols
+            df = (
+                lazy_df.filter(
+                    (pl.col("timestamp") >= st_ut) & (pl.col("timestamp") <= fin_ut)
+                )
+                .select(columns)
+                .collect()
             )
         else:
             logger.info("Create initial df for %s", self.table_name)
@@ -66,18 +92,58 @@ class Table:
         filename = self._parquet_filename()
 
         if os.path.exists(filename):  # "append" existing file
-            cur_df = pl.read_parquet(filename)
-            self.df = pl.concat([cur_df, self.df])
-
-            # drop duplicates
-            self.df = self.df.filter(pl.struct("ID").is_unique())
-            self.df.write_parquet(filename)
-            n_new = self.df.shape[0] - cur_df.shape[0]
-            print(f"  Just appended {n_new} df rows to file {filename}")
+            # drop duplicates within the new rows, in a single hash pass
+            new_df = self.df.unique(subset=["ID"], keep="first", maintain_order=True)
+            n_dups = self.df.shape[0] - new_df.shape[0]
+            if n_dups > 0:
+                logger.info("Dropped %d duplicate rows from new df", n_dups)
+
+            # drop rows already in the file. Only the file's tail, from the
+            # first new timestamp on, can hold them; the scan skips the rest
+            cur_ids_df = (
+                pl.scan_parquet(filename)
+                .filter(pl.col("timestamp") >= new_df["timestamp"].min())
+                .select("ID")
+                .collect()
+            )
+            new_df = new_df.join(cur_ids_df, on="ID", how="anti")
+            if new_df.is_empty():
+                # nothing to append; leave the file as is
+                logger.info("No new df rows to append to file %s", filename)
+                return
+
+            # parquet can't append in place. Rather than reading the whole file
+            # into memory, stream old + new rows into a temp file, then swap it in.
+            # Keep it sorted by timestamp, so row-group stats stay tight. The file
+            # is already sorted, and new rows normally start after its newest
+            # row, so sorting the new rows is enough. Else, re-sort everything
+            new_df = new_df.sort("timestamp")
+            file_utN = _max_timestamp_from_metadata(pq.read_metadata(filename))
+            merged_df = pl.concat([pl.scan_parquet(filename), new_df.lazy()])
+            if file_utN is None or new_df["timestamp"][0] < file_utN:
+                merged_df = merged_df.sort("timestamp")
+
+            tmp_filename = filename + ".tmp"
+            merged_df.sink_parquet(
+                tmp_filename,
+                compression=PARQUET_COMPRESSION,
+                compression_level=PARQUET_COMPRESSION_LEVEL,
+                statistics=True,
+                row_group_size=PARQUET_ROW_GROUP_SIZE,
+            )
+            os.replace(tmp_filename, filename)
+            n_new = new_df.shape[0]
+            logger.info("Just appended %d df rows to file %s", n_new, filename)
         else:  # write new file
-            self.df.write_parquet(filename)
-            print(
-                f"  Just saved df with {self.df.shape[0]} rows to new file {filename}"
+            self.df.sort("timestamp").write_parquet(
+                filename,
+                compression=PARQUET_COMPRESSION,
+                compression_level=PARQUET_COMPRESSION_LEVEL,
+                statistics=True,
+                row_group_size=PARQUET_ROW_GROUP_SIZE,
+            )
+            logger.info(
+                "Just saved df with %d rows to new file %s", self.df.shape[0], filename
             )
 
     @enforce_types
@@ -103,7 +169,8 @@ class Table:
         save_backoff_count = 0
         pagination_offset = 0
 
-        final_df = pl.DataFrame()
+        # fetched dfs are collected here, and concatenated once on save
+        final_dfs: List[pl.DataFrame] = []
 
         while True:
             # call the function
@@ -116,7 +183,7 @@ class Table:
                 network,
             )
 
-            print(f"Fetched {len(data)} from subgraph")
+            logger.info("Fetched %d from subgraph", len(data))
             # convert predictions to df and transform timestamp into ms
             df = _object_list_to_df(data, self.df_schema)
             df = _transform_timestamp_to_ms(df)
@@ -124,31 +191,33 @@ class Table:
                 "timestamp"
             )
 
-            if len(final_df) == 0:
-                final_df = df
-            else:
-                final_df = pl.concat([final_df, df])
-
-            save_backoff_count += len(df)
+            n_df = len(df)
+            final_dfs.append(df)
+            save_backoff_count += n_df
 
             # save to file if requred number of data has been fetched
             if (
-                save_backoff_count >= save_backoff_limit or len(df) < pagination_limit
-            ) and len(final_df) > 0:
+                save_backoff_count >= save_backoff_limit or n_df < pagination_limit
+            ) and save_backoff_count > 0:
                 assert df.schema == self.df_schema
                 # save to parquet
-                self.df = final_df
+                self.df = pl.concat(final_dfs)
                 self.save()
-                print(f"Saved {len(final_df)} records to file while fetching")
-                final_df = pl.DataFrame()
+                logger.info(
+                    "Saved %d records to file while fetching", save_backoff_count
+                )
+                final_dfs = []
                 save_backoff_count = 0
 
             # avoids doing next fetch if we've reached the end
-            if len(df) < pagination_limit:
+            if n_df < pagination_limit:
                 break
             pagination_offset += pagination_limit
 
-    @enforce_types
+        # save() only appends to the file. Read back the fetched time range
+        # once, at the end, rather than the whole file on every save
+        self.load(st_ut=st_ut, fin_ut=fin_ut)
+
     def _parquet_filename(self) -> str:
         """
         @description
@@ -178,14 +247,38 @@ class Table:
         start_ut - timestamp (ut) to start grabbing data for (in ms)
         """
         if not os.path.exists(filename):
-            print("      No file exists yet, so will fetch all data")
+            logger.info("No file exists yet, so will fetch all data")
             return self.ppss.lake_ss.st_timestamp
 
-        print("      File already exists")
-        if not has_data(filename):
-            print("      File has no data, so delete it")
+        logger.info("File already exists")
+        # one footer read answers both "has data?" and "newest timestamp?";
+        # no row data gets decoded
+        metadata = pq.read_metadata(filename)
+        if metadata.num_rows == 0:
+            logger.info("File has no data, so delete it")
             os.remove(filename)
             return self.ppss.lake_ss.st_timestamp
 
-        file_utN = newest_ut(filename)
+        file_utN = _max_timestamp_from_metadata(metadata)
+        if file_utN is None:  # file was written without statistics
+            file_utN = newest_ut(filename)
         return UnixTimeMs(file_utN + 1000)
+
+
+def _max_timestamp_from_metadata(metadata: pq.FileMetaData) -> Optional[int]:
+    """
+    @description
+        Max "timestamp" in a parquet file, from its row-group statistics.
+        Returns None if the file has no rows, or lacks the statistics.
+    """
+    ts_idx = metadata.schema.names.index("timestamp")
+    ts_stats = [
+        metadata.row_group(i).column(ts_idx).statistics
+        for i in range(metadata.num_row_groups)
+        if metadata.row_group(i).num_rows > 0
+    ]
+    if not ts_stats:
+        return None
+    if not all(stats is not None and stats.has_min_max for stats in ts_stats):
+        return None
+    return max(stats.max for stats in ts_stats)
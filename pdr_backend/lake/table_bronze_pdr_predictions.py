@@ -4,10 +4,11 @@ import polars as pl
 from enforce_typing import enforce_types
 from polars import Boolean, Float64, Int64, Utf8
 from pdr_backend.lake.plutil import (
-    pick_df_and_ids_on_period,
+    pick_df_on_period,
 )
 from pdr_backend.lake.table import Table
 from pdr_backend.ppss.ppss import PPSS
+from pdr_backend.util.time_types import UnixTimeMs
 
 
 bronze_pdr_predictions_table_name = "bronze_pdr_predictions"
@@ -29,10 +30,14 @@ bronze_pdr_predictions_schema = {
     "timestamp": Int64,
     "last_event_timestamp": Int64,
 }
+bronze_pdr_predictions_cols = list(bronze_pdr_predictions_schema)
 
 
 def _process_predictions(
-    collision_ids: pl.Series, tables: Dict[str, Table], ppss: PPSS
+    collision_ids: pl.Series,
+    tables: Dict[str, Table],
+    st_ut: UnixTimeMs,
+    fin_ut: UnixTimeMs,
 ) -> Dict[str, Table]:
     """
     @description
@@ -41,56 +46,65 @@ def _process_predictions(
         2. Transform predictions to bronze
         3. Concat to existing table
     """
-    # only add new predictions
-    predictions_df = tables["pdr_predictions"].df.filter(
-        (pl.col("timestamp") >= ppss.lake_ss.st_timestamp)
-        & (pl.col("timestamp") <= ppss.lake_ss.fin_timestamp)
-        & (pl.col("ID").is_in(collision_ids).not_())
-    )
+    # only add new predictions. Anti-join against the ids already in bronze,
+    # so the lookup stays in a native hash join
+    collision_ids_df = pl.DataFrame({"ID": collision_ids}, schema={"ID": Utf8})
+    predictions_df = pick_df_on_period(
+        target=tables["pdr_predictions"].df,
+        start_timestamp=st_ut,
+        finish_timestamp=fin_ut,
+    ).join(collision_ids_df, on="ID", how="anti")
 
     if len(predictions_df) == 0:
         return tables
 
     # transform from raw to bronze_prediction
-    def get_slot_id(_id: str) -> str:
-        slot_id = _id.split("-")[0] + "-" + _id.split("-")[1]
-        return f"{slot_id}"
-
-    bronze_predictions_df = predictions_df.with_columns(
-        [
-            pl.col("ID").map_elements(get_slot_id, return_dtype=Utf8).alias("slot_id"),
-            pl.col("prediction").alias("predvalue"),
-            pl.col("trueval").alias("truevalue"),
-            pl.col("timestamp").alias("timestamp"),
-            pl.col("timestamp").alias("last_event_timestamp"),
-        ]
-    ).select(bronze_pdr_predictions_schema)
-
-    # append to existing dataframe
-    new_bronze_df = pl.concat(
-        [tables[bronze_pdr_predictions_table_name].df, bronze_predictions_df]
+    # slot_id is the f"{contract}-{slot}" prefix of the prediction ID
+    bronze_predictions_df = (
+        predictions_df.rename({"prediction": "predvalue", "trueval": "truevalue"})
+        .with_columns(
+            [
+                pl.col("ID")
+                .str.split("-")
+                .list.slice(0, 2)
+                .list.join("-")
+                .alias("slot_id"),
+                pl.col("timestamp").alias("last_event_timestamp"),
+            ]
+        )
+        .select(bronze_pdr_predictions_cols)
+    )
+
+    # append to existing dataframe. vstack only links the new chunk; the
+    # truevals/payouts joins that follow rebuild the frame contiguously
+    new_bronze_df = tables[bronze_pdr_predictions_table_name].df.vstack(
+        bronze_predictions_df
     )
     tables[bronze_pdr_predictions_table_name].df = new_bronze_df
     return tables
 
 
-def _process_truevals(tables: Dict[str, Table], ppss: PPSS) -> Dict[str, Table]:
+def _process_truevals(
+    tables: Dict[str, Table], st_ut: UnixTimeMs, fin_ut: UnixTimeMs
+) -> Dict[str, Table]:
     """
     Perform post-fetch processing on the data
     """
     # get truevals within the update
-    truevals_df, _ = pick_df_and_ids_on_period(
+    truevals_df = pick_df_on_period(
         target=tables["pdr_truevals"].df,
-        start_timestamp=ppss.lake_ss.st_timestamp,
-        finish_timestamp=ppss.lake_ss.fin_timestamp,
+        start_timestamp=st_ut,
+        finish_timestamp=fin_ut,
     )
 
     # get ref to bronze_predictions
     predictions_df = tables[bronze_pdr_predictions_table_name].df
 
-    # update only the ones within this time range
+    # update only the ones within this time range. Run the whole
+    # join -> fill -> select chain as one lazy query
     predictions_df = (
-        predictions_df.join(truevals_df, left_on="slot_id", right_on="ID", how="left")
+        predictions_df.lazy()
+        .join(truevals_df.lazy(), left_on="slot_id", right_on="ID", how="left")
         .with_columns(
             [
                 pl.col("trueval").fill_null(pl.col("truevalue")),
@@ -104,7 +118,8 @@ def _process_truevals(tables: Dict[str, Table], ppss: PPSS) -> Dict[str, Table]:
                 "timestamp_right": "last_event_timestamp",
             }
         )
-        .select(bronze_pdr_predictions_schema.keys())
+        .select(bronze_pdr_predictions_cols)
+        .collect()
     )
 
     # update dfs
@@ -112,7 +127,9 @@ def _process_truevals(tables: Dict[str, Table], ppss: PPSS) -> Dict[str, Table]:
     return tables
 
 
-def _process_payouts(tables: Dict[str, Table], ppss: PPSS) -> Dict[str, Table]:
+def _process_payouts(
+    tables: Dict[str, Table], st_ut: UnixTimeMs, fin_ut: UnixTimeMs
+) -> Dict[str, Table]:
     """
     @description
         Perform post-fetch processing on the data
@@ -120,18 +137,20 @@ def _process_payouts(tables: Dict[str, Table], ppss: PPSS) -> Dict[str, Table]:
 
     """
     # get payouts within the update
-    payouts_df, _ = pick_df_and_ids_on_period(
+    payouts_df = pick_df_on_period(
         target=tables["pdr_payouts"].df,
-        start_timestamp=ppss.lake_ss.st_timestamp,
-        finish_timestamp=ppss.lake_ss.fin_timestamp,
+        start_timestamp=st_ut,
+        finish_timestamp=fin_ut,
     )
 
     # get existing bronze_predictions we'll be updating
     predictions_df = tables[bronze_pdr_predictions_table_name].df
 
-    # do work to join from pdr_payout onto bronze_pdr_predictions
+    # do work to join from pdr_payout onto bronze_pdr_predictions, as one
+    # lazy query
     predictions_df = (
-        predictions_df.join(payouts_df, on=["ID"], how="left")
+        predictions_df.lazy()
+        .join(payouts_df.lazy(), on=["ID"], how="left")
         .with_columns(
             [
                 pl.col("payout_right").fill_null(pl.col("payout")),
@@ -149,7 +168,8 @@ def _process_payouts(tables: Dict[str, Table], ppss: PPSS) -> Dict[str, Table]:
                 "timestamp_right": "last_event_timestamp",
             }
         )
-        .select(bronze_pdr_predictions_schema.keys())
+        .select(bronze_pdr_predictions_cols)
+        .collect()
     )
 
     # update dfs
@@ -164,18 +184,22 @@ def get_bronze_pdr_predictions_table(gql_tables: Dict[str, Table], ppss: PPSS) -
         Updates/Creates clean predictions from existing raw tables
     """
 
+    # snapshot the time range once; fin_timestamp may be "now", and must not
+    # move between the processing steps below
+    st_ut = ppss.lake_ss.st_timestamp
+    fin_ut = ppss.lake_ss.fin_timestamp
+
     collision_ids: pl.Series = pl.Series([])
     # retrieve pred ids that are already in the lake
     if len(gql_tables[bronze_pdr_predictions_table_name].df) > 0:
         collision_ids = gql_tables[bronze_pdr_predictions_table_name].df.filter(
-            (pl.col("timestamp") >= ppss.lake_ss.st_timestamp)
-            & (pl.col("timestamp") <= ppss.lake_ss.fin_timestamp)
+            (pl.col("timestamp") >= st_ut) & (pl.col("timestamp") <= fin_ut)
         )["ID"]
 
     # do post sync processing
-    gql_tables = _process_predictions(collision_ids, gql_tables, ppss)
-    gql_tables = _process_truevals(gql_tables, ppss)
-    gql_tables = _process_payouts(gql_tables, ppss)
+    gql_tables = _process_predictions(collision_ids, gql_tables, st_ut, fin_ut)
+    gql_tables = _process_truevals(gql_tables, st_ut, fin_ut)
+    gql_tables = _process_payouts(gql_tables, st_ut, fin_ut)
 
     # after all post processing, return bronze_predictions
     return gql_tables[bronze_pdr_predictions_table_name]
@@ -1,9 +1,12 @@
+import os
+import time
 from unittest.mock import patch
 from io import StringIO
 import sys
 import polars as pl
 from pdr_backend.ppss.ppss import mock_ppss
 from pdr_backend.lake.gql_data_factory import GQLDataFactory
+from pdr_backend.util.time_types import UnixTimeMs
 
 
 def mock_fetch_function(
@@ -59,13 +62,99 @@ def test_update():
 
     captured_output = StringIO()
     sys.stdout = captured_output
-    gql_data_factory._update()
+    gql_data_factory._update(ppss.lake_ss.st_timestamp, ppss.lake_ss.fin_timestamp)
 
     printed_text = captured_output.getvalue().strip()
     count_updates = printed_text.count("Updating")
     assert count_updates == len(gql_data_factory.record_config["tables"].items())
 
 
+@patch("pdr_backend.lake.gql_data_factory.get_all_contract_ids_by_owner")
+def test_contract_list_cache(mock_get_contract_ids, tmpdir, monkeypatch):
+    """
+    Test GQLDataFactory caches the contract list on disk
+    """
+    monkeypatch.setenv("PDR_CONTRACT_CACHE_TTL", "3600")
+    mock_get_contract_ids.return_value = ["0xABC"]
+    ppss = mock_ppss(
+        [{"predict": "binance BTC/USDT c 5m", "train_on": "binance BTC/USDT c 5m"}],
+        "sapphire-mainnet",
+        str(tmpdir),
+        st_timestr="2023-12-03",
+        fin_timestr="2024-12-05",
+    )
+    cache_filename = os.path.join(
+        ppss.lake_ss.parquet_dir, ".contract_list.mainnet.json"
+    )
+
+    # first init fetches, second init is served from the cache
+    gql_data_factory = GQLDataFactory(ppss)
+    gql_data_factory = GQLDataFactory(ppss)
+    assert mock_get_contract_ids.call_count == 1
+    assert gql_data_factory.record_config["config"]["contract_list"] == ["0xabc"]
+
+    # a corrupt cache is a cache miss, and gets rewritten
+    with open(cache_filename, "w") as f:
+        f.write('{"owner_addrs": ')
+    GQLDataFactory(ppss)
+    assert mock_get_contract_ids.call_count == 2
+    GQLDataFactory(ppss)
+    assert mock_get_contract_ids.call_count == 2
+
+    # an expired cache gets refetched
+    old_time = time.time() - 7200
+    os.utime(cache_filename, (old_time, old_time))
+    GQLDataFactory(ppss)
+    assert mock_get_contract_ids.call_count == 3
+
+    # a bad TTL falls back to the default
+    monkeypatch.setenv("PDR_CONTRACT_CACHE_TTL", "soon")
+    GQLDataFactory(ppss)
+    assert mock_get_contract_ids.call_count == 3
+
+    # an empty list isn't cached
+    os.remove(cache_filename)
+    mock_get_contract_ids.return_value = []
+    GQLDataFactory(ppss)
+    assert not os.path.exists(cache_filename)
+
+    # a TTL of 0 disables the cache: no reads, no writes
+    monkeypatch.setenv("PDR_CONTRACT_CACHE_TTL", "0")
+    mock_get_contract_ids.return_value = ["0xABC"]
+    GQLDataFactory(ppss)
+    assert not os.path.exists(cache_filename)
+    assert not [f for f in os.listdir(ppss.lake_ss.parquet_dir) if ".tmp" in f]
+
+
+@patch("pdr_backend.lake.gql_data_factory.get_all_contract_ids_by_owner")
+def test_update_table_nothing_to_fetch(mock_get_contract_ids, tmpdir):
+    """
+    Test that a table whose start time is past fin isn't fetched, but is
+    still reloaded over the given time range
+    """
+    mock_get_contract_ids.return_value = ["0x123"]
+    ppss = mock_ppss(
+        [{"predict": "binance BTC/USDT c 5m", "train_on": "binance BTC/USDT c 5m"}],
+        "sapphire-mainnet",
+        str(tmpdir),
+        st_timestr="2023-12-03",
+        fin_timestr="2023-12-05",
+    )
+    gql_data_factory = GQLDataFactory(ppss)
+    table = gql_data_factory.record_config["tables"]["pdr_predictions"]
+    st_ut = ppss.lake_ss.st_timestamp
+    fin_ut = ppss.lake_ss.fin_timestamp
+
+    with patch.object(table, "_calc_start_ut") as mock_calc_start_ut, patch.object(
+        table, "get_pdr_df"
+    ) as mock_get_pdr_df, patch.object(table, "load") as mock_load:
+        mock_calc_start_ut.return_value = UnixTimeMs(fin_ut + 1000)
+        gql_data_factory._update_table(table, st_ut, fin_ut)
+
+    assert mock_get_pdr_df.call_count == 0
+    mock_load.assert_called_once_with(st_ut=st_ut, fin_ut=fin_ut)
+
+
 def test_load_parquet():
     """
     Test GQLDataFactory loads the data for all the tables
@@ -6,6 +6,8 @@ from pdr_backend.lake.constants import (
     OHLCV_DTYPES,
     OHLCV_MULT_MAX,
     OHLCV_MULT_MIN,
+    PARQUET_COMPRESSION_LEVEL,
+    PARQUET_ROW_GROUP_SIZE,
     TOHLCV_COLS,
     TOHLCV_DTYPES,
     TOHLCV_SCHEMA_PL,
@@ -31,3 +33,6 @@ def test_lake_constants():
     assert TOHLCV_COLS[0] in TOHLCV_SCHEMA_PL
 
     assert 0 < OHLCV_MULT_MIN <= OHLCV_MULT_MAX < np.inf
+
+    assert 0 < PARQUET_ROW_GROUP_SIZE
+    assert 1 <= PARQUET_COMPRESSION_LEVEL <= 22
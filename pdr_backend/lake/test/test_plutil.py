@@ -2,6 +2,7 @@ import os
 
 import numpy as np
 import polars as pl
+import pyarrow.parquet as pq
 import pytest
 from enforce_typing import enforce_types
 
@@ -19,6 +20,7 @@ from pdr_backend.lake.plutil import (
     load_rawohlcv_file,
     newest_ut,
     oldest_ut,
+    pick_df_on_period,
     save_rawohlcv_file,
     set_col_values,
     text_to_df,
@@ -207,6 +209,27 @@ def _df_from_raw_data(raw_data: list) -> pl.DataFrame:
     return df
 
 
+@enforce_types
+def test_save_rawohlcv_file_parquet_settings(tmpdir):
+    def _assert_zstd_with_stats(filename):
+        metadata = pq.read_metadata(filename)
+        for i in range(metadata.num_row_groups):
+            ts_col = metadata.row_group(i).column(0)
+            assert ts_col.path_in_schema == "timestamp"
+            assert ts_col.compression == "ZSTD"
+            assert ts_col.statistics is not None
+            assert ts_col.statistics.has_min_max
+
+    # new-file write
+    filename = _filename(tmpdir)
+    save_rawohlcv_file(filename, _df_from_raw_data(FOUR_ROWS_RAW_TOHLCV_DATA))
+    _assert_zstd_with_stats(filename)
+
+    # streamed append
+    save_rawohlcv_file(filename, _df_from_raw_data(ONE_ROW_RAW_TOHLCV_DATA))
+    _assert_zstd_with_stats(filename)
+
+
 @enforce_types
 def test_has_data(tmpdir):
     filename0 = os.path.join(tmpdir, "f0.parquet")
@@ -304,3 +327,15 @@ def test_text_to_df():
     assert df["timestamp"][0] == 0
     assert df["open"][1] == 10.1
     assert isinstance(df["open"][1], float)
+
+
+@enforce_types
+def test_pick_df_on_period():
+    df = pl.DataFrame({"ID": ["a", "b", "c", "d"], "timestamp": [0, 1, 2, 3]})
+
+    # bounds are inclusive
+    picked_df = pick_df_on_period(df, 1, 2)
+    assert picked_df["ID"].to_list() == ["b", "c"]
+    assert picked_df.columns == df.columns
+
+    assert pick_df_on_period(df, 4, 5).is_empty()
@@ -1,6 +1,4 @@
-from io import StringIO
 import os
-import sys
 from polars import Boolean, Float64, Int64, Utf8
 import polars as pl
 from pdr_backend.ppss.ppss import mock_ppss
@@ -111,7 +109,7 @@ def test_load_table():
     assert len(table.df) == 0
 
 
-def test_save_table():
+def test_save_table(caplog):
     """
     Test that table is saving to local file
     """
@@ -127,17 +125,126 @@ def test_save_table():
 
     table = Table(table_name, table_df_schema, ppss)
 
-    captured_output = StringIO()
-    sys.stdout = captured_output
-
     assert len(table.df) == 0
     table.df = pl.DataFrame([mocked_object], table_df_schema)
     table.save()
 
     assert os.path.exists(file_path)
-    printed_text = captured_output.getvalue().strip()
+    assert "Just saved df with" in caplog.text
+
+
+def test_save_table_append(tmpdir):
+    """
+    Test that saving to an existing file appends only the new rows
+    """
+    ppss = mock_ppss(
+        [{"predict": "binance BTC/USDT c 5m", "train_on": "binance BTC/USDT c 5m"}],
+        "sapphire-mainnet",
+        str(tmpdir),
+        st_timestr="2023-12-03",
+        fin_timestr="2023-12-05",
+    )
+
+    table = Table(table_name, table_df_schema, ppss)
+    table.df = pl.DataFrame([mocked_object], table_df_schema)
+    table.save()
+
+    # save the same row again, plus a newer one given twice
+    newer_object = {**mocked_object, "ID": "0x456", "timestamp": 1701634500000}
+    table.df = pl.DataFrame(
+        [mocked_object, newer_object, newer_object], table_df_schema
+    )
+    table.save()
+
+    df = pl.read_parquet(table._parquet_filename())
+    assert df["ID"].to_list() == ["0x123", "0x456"]
+
+    # rows older than the file's newest still land in timestamp order
+    older_object = {**mocked_object, "ID": "0x789", "timestamp": 1701634300000}
+    table.df = pl.DataFrame([older_object], table_df_schema)
+    table.save()
+    df = pl.read_parquet(table._parquet_filename())
+    assert df["ID"].to_list() == ["0x789", "0x123", "0x456"]
 
-    assert "Just saved df with" in printed_text
+    # saving only rows the file already has leaves it untouched
+    mtime = os.path.getmtime(table._parquet_filename())
+    table.df = pl.DataFrame([newer_object], table_df_schema)
+    table.save()
+    assert os.path.getmtime(table._parquet_filename()) == mtime
+
+    # load reads back the merged file
+    table.load()
+    assert table.df["ID"].to_list() == ["0x789", "0x123", "0x456"]
+
+
+def test_calc_start_ut(tmpdir):
+    """
+    Test that the start time comes from the newest timestamp in the file
+    """
+    ppss = mock_ppss(
+        [{"predict": "binance BTC/USDT c 5m", "train_on": "binance BTC/USDT c 5m"}],
+        "sapphire-mainnet",
+        str(tmpdir),
+        st_timestr="2023-12-03",
+        fin_timestr="2023-12-05",
+    )
+
+    table = Table(table_name, table_df_schema, ppss)
+    filename = table._parquet_filename()
+
+    # no file: start from the configured start time
+    assert table._calc_start_ut(filename) == ppss.lake_ss.st_timestamp
+
+    # file with data: start just after its newest row
+    newer_object = {**mocked_object, "ID": "0x456", "timestamp": 1701634500000}
+    table.df = pl.DataFrame([mocked_object, newer_object], table_df_schema)
+    table.save()
+    assert table._calc_start_ut(filename) == UnixTimeMs(1701634500000 + 1000)
+
+    # empty file: delete it, and start from the configured start time
+    pl.DataFrame([], table_df_schema).write_parquet(filename)
+    assert table._calc_start_ut(filename) == ppss.lake_ss.st_timestamp
+    assert not os.path.exists(filename)
+
+
+def test_load_table_columns(tmpdir):
+    """
+    Test that load only reads the requested columns
+    """
+    ppss = mock_ppss(
+        [{"predict": "binance BTC/USDT c 5m", "train_on": "binance BTC/USDT c 5m"}],
+        "sapphire-mainnet",
+        str(tmpdir),
+        st_timestr="2023-12-03",
+        fin_timestr="2023-12-05",
+    )
+
+    table = Table(table_name, table_df_schema, ppss)
+    table.df = pl.DataFrame([mocked_object], table_df_schema)
+    table.save()
+
+    table.load()
+    assert table.df.columns == list(table_df_schema)
+
+    table.load(columns=["ID", "timestamp"])
+    assert table.df.columns == ["ID", "timestamp"]
+    assert table.df["ID"].to_list() == ["0x123"]
+
+    # an explicit time range overrides lake_ss's
+    table.load(st_ut=UnixTimeMs(1701634400000 + 1), fin_ut=UnixTimeMs(1701634500000))
+    assert len(table.df) == 0
+
+    # the timestamp filter doesn't need timestamp among the read columns
+    table.load(columns=["ID"])
+    assert table.df.columns == ["ID"]
+    assert table.df["ID"].to_list() == ["0x123"]
+
+    # a file that lacks some schema columns still loads
+    pl.DataFrame([mocked_object], table_df_schema).drop("user").write_parquet(
+        table._parquet_filename()
+    )
+    table.load()
+    assert table.df.columns == [c for c in table_df_schema if c != "user"]
 
 
 def test_all():
@@ -196,7 +303,47 @@ def test_get_pdr_df():
     assert len(table.df) == 1
 
 
-def test_get_pdr_df_multiple_fetches():
+def test_get_pdr_df_paged_saves(tmpdir):
+    """
+    Test that after several paged fetches and saves, the table's df holds
+    every saved row, not just the last saved batch
+    """
+    ppss = mock_ppss(
+        [{"predict": "binance BTC/USDT c 5m", "train_on": "binance BTC/USDT c 5m"}],
+        "sapphire-mainnet",
+        str(tmpdir),
+        st_timestr="2023-12-03",
+        fin_timestr="2023-12-05",
+    )
+    table = Table(table_name, table_df_schema, ppss)
+
+    # 50 rows, served in pages of 20, 20, 10
+    rows = [
+        MyClass({**mocked_object, "ID": f"0x{i}", "timestamp": 1701634400 + i})
+        for i in range(50)
+    ]
+
+    def paged_fetch_function(
+        st_ut, fin_ut, contract_list, pagination_limit, pagination_offset, network
+    ):
+        print(st_ut, fin_ut, contract_list, network)
+        return rows[pagination_offset : pagination_offset + pagination_limit]
+
+    table.get_pdr_df(
+        paged_fetch_function,
+        "sapphire-mainnet",
+        UnixTimeMs(1701634400000),
+        UnixTimeMs(1701634500000),
+        40,
+        20,
+        {"contract_list": ["0x123"]},
+    )
+
+    assert len(pl.read_parquet(table._parquet_filename())) == 50
+    assert len(table.df) == 50
+
+
+def test_get_pdr_df_multiple_fetches(caplog):
     """
     Test multiple table actions in one go
     """
@@ -212,8 +359,6 @@ def test_get_pdr_df_multiple_fetches():
     )
 
     table = Table("test_prediction_table_multiple", predictions_schema, ppss)
-    captured_output = StringIO()
-    sys.stdout = captured_output
 
     save_backoff_limit = 40
     pagination_limit = 20
@@ -228,14 +373,13 @@ def test_get_pdr_df_multiple_fetches():
         pagination_limit=pagination_limit,
         config={"contract_list": ["0x18f54cc21b7a2fdd011bea06bba7801b280e3151"]},
     )
-    printed_text = captured_output.getvalue().strip()
 
     # test fetches multiple times
-    count_fetches = printed_text.count("Fetched")
+    count_fetches = caplog.text.count("Fetched")
     assert count_fetches == 3
 
     # test saves multiple times
-    count_saves = printed_text.count("Saved")
+    count_saves = caplog.text.count("Saved")
     assert count_saves == 2
 
     assert len(table.df) == 50
@@ -36,6 +36,8 @@ def test_table_bronze_pdr_predictions(
         st_timestr,
         fin_timestr,
     )
+    st_ut = ppss.lake_ss.st_timestamp
+    fin_ut = ppss.lake_ss.fin_timestamp
 
     gql_tables = {
         "pdr_predictions": Table(predictions_table_name, predictions_schema, ppss),
@@ -55,13 +57,13 @@ def test_table_bronze_pdr_predictions(
     # Work 1: Append new predictions onto bronze_table
     # In our mock, all predictions have None truevalue, payout, etc...
     # This shows that all of this data will come from other tables
-    gql_tables = _process_predictions([], gql_tables, ppss)
+    gql_tables = _process_predictions([], gql_tables, st_ut, fin_ut)
     assert len(gql_tables["bronze_pdr_predictions"].df) == 6
     assert gql_tables["bronze_pdr_predictions"].df["truevalue"].null_count() == 6
     assert gql_tables["bronze_pdr_predictions"].df["payout"].null_count() == 6
 
     # Work 2: Append from bronze_pdr_truevals table
-    gql_tables = _process_truevals(gql_tables, ppss)
+    gql_tables = _process_truevals(gql_tables, st_ut, fin_ut)
 
     # We should still have 6 rows
     assert len(gql_tables["bronze_pdr_predictions"].df) == 6
@@ -69,7 +71,7 @@ def test_table_bronze_pdr_predictions(
     assert gql_tables["bronze_pdr_predictions"].df["truevalue"].null_count() == 1
 
     # Work 3: Append from bronze_pdr_payouts table
-    gql_tables = _process_payouts(gql_tables, ppss)
+    gql_tables = _process_payouts(gql_tables, st_ut, fin_ut)
 
     assert len(gql_tables["bronze_pdr_predictions"].df) == 6
 
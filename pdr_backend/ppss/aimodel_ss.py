@@ -19,6 +19,12 @@ CALIBRATE_PROBS_OPTIONS = [
     "None",
 ]
 
+# calibrate_probs option -> 'method' argument in sklearn CalibratedClassifierCV()
+CALIBRATE_PROBS_SKMETHODS = {
+    "CalibratedClassifierCV_Sigmoid": "sigmoid",
+    "CalibratedClassifierCV_Isotonic": "isotonic",
+}
+
 
 class AimodelSS(StrMixin):
     __STR_OBJDIR__ = ["d"]
@@ -89,11 +95,9 @@ class AimodelSS(StrMixin):
             return "sigmoid"
 
         c = self.calibrate_probs
-        if c == "CalibratedClassifierCV_Sigmoid":
-            return "sigmoid"
-        if c == "CalibratedClassifierCV_Isotonic":
-            return "isotonic"
-        raise ValueError(c)
+        if c not in CALIBRATE_PROBS_SKMETHODS:
+            raise ValueError(c)
+        return CALIBRATE_PROBS_SKMETHODS[c]
 
 
 # =========================================================================
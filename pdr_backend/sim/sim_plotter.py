@@ -1,6 +1,7 @@
 import glob
 import os
 import pickle
+import shutil
 import time
 from datetime import datetime
 from pathlib import Path
@@ -82,13 +83,10 @@ class SimPlotter:
         return self.st, "final"
 
     def init_state(self, multi_id):
-        files = glob.glob("sim_state/{multi_id}/*")
-
         self.multi_id = multi_id
 
-        for f in files:
-            os.remove(f)
-
+        # start from an empty state dir
+        shutil.rmtree(f"sim_state/{multi_id}", ignore_errors=True)
         os.makedirs(f"sim_state/{multi_id}")
 
     def save_state(